@@ -22,14 +22,17 @@ class MusicBot(commands.Bot):
         self.play_locks = {}
         self.current_song = {}
         self.play_history = {}
+        self.play_history_counts = {}  # Per-guild Counter kept in sync with play_history
         
         # Recommendation system
         self.recommendation_enabled = {}
         self.recommendation_history = {}
+        self.recommendation_history_sets = {}  # Mirrors recommendation_history for O(1) membership
         self.max_recommendation_history = config.MAX_RECOMMENDATION_HISTORY
         
         # Replay mode
         self.replay_mode = {}  # Store replay mode state for each guild
+        self.skip_operations = {}  # Per-guild flag marking skip-triggered track ends
         # Library manager
         self.library_manager = LibraryManager()
 
@@ -44,7 +47,7 @@ class MusicBot(commands.Bot):
 
     async def on_ready(self):
         """Called when the bot is ready."""
-        logging.info(f'We have logged in as {self.user}')
+        logging.info('We have logged in as %s', self.user)
         
     async def on_message(self, message):
         """Handle incoming messages."""
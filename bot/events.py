@@ -1,11 +1,19 @@
 import nextcord
 import mafic
 import logging
-from utils import format_duration
+from utils import format_duration, batch_fetch_author_tracks
 from collections import Counter, deque
 import random
 import config
 
+# Skeleton for the batched recommendation notice; from_dict skips
+# re-running the Embed constructor arguments on every pass.
+_RECOMMENDED_EMBED_TEMPLATE = {
+    "title": "Recommended Tracks Added",
+    "color": nextcord.Color.green().value,
+    "type": "rich",
+}
+
 async def on_track_start(bot, event: mafic.TrackStartEvent):
     """Handle track start events."""
     player = event.player
@@ -13,13 +21,22 @@ async def on_track_start(bot, event: mafic.TrackStartEvent):
     guild_id = player.guild.id
     bot.current_song[guild_id] = track
     
-    # Record play history
-    if guild_id not in bot.play_history:
-        bot.play_history[guild_id] = []
-    bot.play_history[guild_id].append(track.author)
-    
-    # Keep only the last 100 played songs
-    bot.play_history[guild_id] = bot.play_history[guild_id][-100:]
+    # Record play history, keeping the per-author counts in step so the
+    # recommendation paths never have to rescan the whole history. The
+    # deque's maxlen bounds the history without slice-and-rebind churn.
+    history = bot.play_history.get(guild_id)
+    if history is None:
+        history = bot.play_history[guild_id] = deque(maxlen=bot.max_recommendation_history)
+        counts = bot.play_history_counts[guild_id] = Counter()
+    else:
+        counts = bot.play_history_counts[guild_id]
+    if len(history) == history.maxlen:
+        evicted = history[0]
+        counts[evicted] -= 1
+        if not counts[evicted]:
+            del counts[evicted]
+    history.append(track.author)
+    counts[track.author] += 1
     
     if guild_id in bot.text_channels:
         embed = nextcord.Embed(title="Now Playing", color=nextcord.Color.green())
@@ -35,13 +52,8 @@ async def on_track_end(bot, event: mafic.TrackEndEvent):
     player = event.player
     guild_id = player.guild.id
     
-    # Check if this is a skip operation
-    is_skip = False
-    if hasattr(bot, 'skip_operations'):
-        is_skip = bot.skip_operations.get(guild_id, False)
-        # Reset the skip flag
-        if is_skip:
-            bot.skip_operations[guild_id] = False
+    # Check if this is a skip operation, resetting the flag either way
+    is_skip = bot.skip_operations.pop(guild_id, False)
     
     # Check if we're in replay mode and should replay the current song
     # Only replay if replay mode is on and this is not a skip operation
@@ -59,7 +71,7 @@ async def on_track_end(bot, event: mafic.TrackEndEvent):
                 await bot.text_channels[guild_id].send(embed=embed)
             return  # Skip the rest of the function
         except Exception as e:
-            logging.error(f"Error replaying track: {e}")
+            logging.error("Error replaying track: %s", e)
             # If replay fails, continue with normal flow
     
     # Normal flow (if not in replay mode or replay failed)
@@ -91,9 +103,9 @@ async def play_next(bot, player: mafic.Player):
         try:
             await player.play(next_track)
             bot.current_song[guild_id] = next_track
-            logging.info(f"Started playing: {next_track.title}")
+            logging.info("Started playing: %s", next_track.title)
         except Exception as e:
-            logging.error(f"Error playing track: {e}")
+            logging.error("Error playing track: %s", e)
             if guild_id in bot.text_channels:
                 embed = nextcord.Embed(title="Playback Error", color=nextcord.Color.red())
                 embed.add_field(name="Error", value=f"Error playing track: {e}", inline=False)
@@ -111,56 +123,97 @@ async def play_next(bot, player: mafic.Player):
 
 async def check_and_recommend(bot, player: mafic.Player, guild_id: int):
     """Check if recommendations are needed and add them to the queue."""
-    if (bot.recommendation_enabled.get(guild_id, False) and 
-        len(bot.music_queues[guild_id]) <= 1 and 
-        guild_id in bot.play_history and 
-        bot.play_history[guild_id]):
-        
-        # Initialize recommendation history for the guild if it doesn't exist
-        if guild_id not in bot.recommendation_history:
-            bot.recommendation_history[guild_id] = deque(maxlen=bot.max_recommendation_history)
-        
-        # Get the most common authors from play history
-        author_counts = Counter(bot.play_history[guild_id])
-        common_authors = [author for author, _ in author_counts.most_common()]
-        
-        # Randomly select up to 10 authors (or all if less than 10)
-        num_authors = min(10, len(common_authors))
-        selected_authors = random.sample(common_authors, num_authors)
-        
-        recommended_tracks = 0
-        added_tracks = set()  # To keep track of added tracks and avoid duplicates
-        
-        for author in selected_authors:
-            if recommended_tracks >= 10:
-                break
-            
-            query = f"{author} music"
-            try:
-                results = await player.fetch_tracks(query, search_type=mafic.SearchType.YOUTUBE)
-                if results:
-                    for track in results:
-                        track_id = (track.title, track.author)
-                        # Check if the track is not in recommendation history, not in added_tracks, and not in the current queue
-                        if (track_id not in bot.recommendation_history[guild_id] and
-                            track_id not in added_tracks and
-                            not any(t.title == track.title and t.author == track.author for t in bot.music_queues[guild_id])):
-                            
-                            bot.music_queues[guild_id].append(track)
-                            added_tracks.add(track_id)
-                            bot.recommendation_history[guild_id].append(track_id)
-                            recommended_tracks += 1
-                            if guild_id in bot.text_channels:
-                                embed = nextcord.Embed(title="Recommended Track Added", color=nextcord.Color.green())
-                                embed.add_field(name="Title", value=track.title, inline=False)
-                                embed.add_field(name="Author", value=track.author, inline=False)
-                                await bot.text_channels[guild_id].send(embed=embed)
-                            break  # Move to the next author after adding one track
-            except Exception as e:
-                logging.error(f"Error fetching recommendation for {author}: {e}")
+    # Cheapest check first: bail before touching the queue on the many
+    # guilds that never enable recommendations
+    if not bot.recommendation_enabled.get(guild_id, False):
+        return
+    queue = bot.music_queues.get(guild_id)
+    if queue is None or len(queue) > 1:
+        return
+    if not bot.play_history.get(guild_id):
+        return
+    # Initialize recommendation history for the guild if it doesn't exist
+    if guild_id not in bot.recommendation_history:
+        bot.recommendation_history[guild_id] = deque(maxlen=bot.max_recommendation_history)
+        bot.recommendation_history_sets[guild_id] = set()
+    rec_history = bot.recommendation_history[guild_id]
+    rec_history_ids = bot.recommendation_history_sets[guild_id]
+    
+    # Sample up to 10 authors weighted by how often they appear in the
+    # history (counts are maintained incrementally alongside play_history),
+    # so auto-recommendations lean toward the most-played artists
+    author_counts = bot.play_history_counts[guild_id]
+    authors = list(author_counts.keys())
+    weights = list(author_counts.values())
+    if len(authors) <= 10:
+        selected_authors = authors
+    else:
+        selected_authors = []
+        picked = set()
+        while len(selected_authors) < 10:
+            author = random.choices(authors, weights=weights, k=1)[0]
+            if author not in picked:
+                picked.add(author)
+                selected_authors.append(author)
+    
+    # One batched round of concurrent searches over the shared connection
+    results_per_author = await batch_fetch_author_tracks(player, selected_authors)
+
+    text_channel = bot.text_channels.get(guild_id)
+    added = []  # Tracks actually queued this pass
+    added_tracks = set()  # To keep track of added tracks and avoid duplicates
+    queue_ids = {(t.title, t.author) for t in queue}  # Companion set for O(1) duplicate checks
+    
+    for author, results in zip(selected_authors, results_per_author):
+        if len(added) >= 10:
+            break
+        if isinstance(results, Exception):
+            logging.error("Error fetching recommendation for %s: %s", author, results)
+            continue
+        if not results:
+            continue
+        # First result not in the recommendation history, this pass's
+        # additions, or the current queue
+        track = next(
+            (t for t in results
+             if (tid := (t.title, t.author)) not in rec_history_ids
+             and tid not in added_tracks
+             and tid not in queue_ids),
+            None
+        )
+        if track is None:
+            continue
+        track_id = (track.title, track.author)
+        queue.append(track)
+        queue_ids.add(track_id)
+        added_tracks.add(track_id)
+        if len(rec_history) == rec_history.maxlen:
+            # The deque is about to evict its oldest id
+            rec_history_ids.discard(rec_history[0])
+        rec_history.append(track_id)
+        rec_history_ids.add(track_id)
+        added.append(track)
+    
+    # One message for the whole batch instead of one API call per track
+    if added and text_channel is not None:
+        embed = nextcord.Embed.from_dict(_RECOMMENDED_EMBED_TEMPLATE)
+        # A field value caps at 1024 characters; trimming each line to 96
+        # keeps even a full batch of 10 long-titled tracks under the limit
+        lines = []
+        for t in added:
+            line = f"• {t.title} — {t.author}"
+            if len(line) > 96:
+                line = line[:95] + "…"
+            lines.append(line)
+        embed.add_field(name="Tracks", value="\n".join(lines), inline=False)
+        await text_channel.send(embed=embed)
 
 def manage_recommendation_history(bot, guild_id: int):
     """Manage the recommendation history for a guild."""
     if guild_id in bot.recommendation_history:
-        while len(bot.recommendation_history[guild_id]) > bot.max_recommendation_history:
-            bot.recommendation_history[guild_id].popleft()
\ No newline at end of file
+        history = bot.recommendation_history[guild_id]
+        history_ids = bot.recommendation_history_sets.get(guild_id)
+        while len(history) > bot.max_recommendation_history:
+            evicted = history.popleft()
+            if history_ids is not None:
+                history_ids.discard(evicted)
\ No newline at end of file
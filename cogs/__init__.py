@@ -1 +1,7 @@
-from .cog_base import CogBase
\ No newline at end of file
+# Extensions loaded at startup, frozen here so main doesn't have to
+# discover them at runtime.
+ALL_COGS = (
+    "cogs.music",
+    "cogs.recommendations",
+    "cogs.library",
+)
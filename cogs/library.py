@@ -6,13 +6,13 @@ import logging
 import json
 import os
 from typing import Optional, List, Dict, Union
-from collections import deque
 import unicodedata
 import random
 import re
 
 import config
 from cogs.cog_base import CogBase
+from utils import TrackQueue, format_duration
 
 class Library(CogBase):
     """Commands for managing music libraries."""
@@ -393,7 +393,7 @@ class Library(CogBase):
         for i, track in enumerate(page_tracks, start=start_idx + 1):
             track_title = track.get('title', 'Unknown')
             track_author = track.get('author', 'Unknown')
-            duration = self._format_duration(track.get('length', 0))
+            duration = format_duration(track.get('length', 0))
             embed.add_field(name=f"{i}. {track_title}", value=f"By: {track_author} ({duration})", inline=False)
         
         await inter.send(embed=embed)
@@ -437,7 +437,7 @@ class Library(CogBase):
         # Initialize bot state for this guild if needed
         self.bot.text_channels[guild_id] = inter.channel
         if guild_id not in self.bot.music_queues:
-            self.bot.music_queues[guild_id] = deque()
+            self.bot.music_queues[guild_id] = TrackQueue()
         
         # Get or create player for playback
         if not inter.guild.voice_client or not isinstance(inter.guild.voice_client, mafic.Player):
@@ -729,17 +729,6 @@ class Library(CogBase):
                 return lib_key
         
         return None
-    
-    def _format_duration(self, duration_ms: int) -> str:
-        """Format duration in milliseconds to a human-readable string."""
-        seconds = duration_ms // 1000
-        minutes, seconds = divmod(seconds, 60)
-        hours, minutes = divmod(minutes, 60)
-        
-        if hours > 0:
-            return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-        else:
-            return f"{minutes:02d}:{seconds:02d}"
 
 
 def setup(bot):
@@ -1,13 +1,38 @@
 import nextcord
 from nextcord.ext import commands
 import mafic
-from utils import is_youtube_url, format_duration
-from collections import deque
-import random
+import functools
+import weakref
+from utils import is_youtube_url, format_duration, format_progress_bar, TrackQueue
 import config
 
 from .cog_base import CogBase
-from bot.events import play_next
+from bot.events import play_next, on_track_start, on_track_end
+
+# Embed colors are value objects; build them once instead of per embed.
+_RED = nextcord.Color.red()
+_GREEN = nextcord.Color.green()
+_BLUE = nextcord.Color.blue()
+_YELLOW = nextcord.Color.yellow()
+
+def _error_embed(message: str) -> nextcord.Embed:
+    """Build a standard error embed with a single message field."""
+    embed = nextcord.Embed(title="Error", color=_RED)
+    embed.add_field(name="Message", value=message, inline=False)
+    return embed
+
+# Static responses reused across commands; built once at import time.
+_NOT_IN_VC_EMBED = _error_embed("You need to be in a voice channel!")
+_ALREADY_IN_VC_EMBED = _error_embed("I'm already in a different voice channel. Please join my channel or use the stop command first.")
+_NO_RESULTS_EMBED = nextcord.Embed(title="No Results", color=_YELLOW)
+_NO_RESULTS_EMBED.add_field(name="Message", value="No tracks found.", inline=False)
+
+
+def _get_player(inter: nextcord.Interaction) -> "mafic.Player | None":
+    """Return the guild's active player, or None if the bot isn't connected."""
+    vc = inter.guild.voice_client
+    return vc if isinstance(vc, mafic.Player) else None
+
 
 class Music(CogBase):
     """Music commands for the bot."""
@@ -15,40 +40,42 @@ class Music(CogBase):
     @commands.Cog.listener()
     async def on_track_start(self, event: mafic.TrackStartEvent):
         """Forward track start events to the bot's event handler."""
-        from bot.events import on_track_start
         await on_track_start(self.bot, event)
 
     @commands.Cog.listener()
     async def on_track_end(self, event: mafic.TrackEndEvent):
         """Forward track end events to the bot's event handler."""
-        from bot.events import on_track_end
         await on_track_end(self.bot, event)
 
-    async def create_timeout_handler(self, inter: nextcord.Interaction, player: mafic.Player):
-        """Create a timeout handler for a view."""
-        async def on_timeout():
-            # Check if the player is still in use
-            if not player.current and player.connected:
-                guild_id = inter.guild_id
-                if guild_id in self.bot.music_queues and not self.bot.music_queues[guild_id]:
-                    await player.disconnect()
-                    if guild_id in self.bot.text_channels:
-                        await self.bot.text_channels[guild_id].send("Search timed out. Disconnected from the voice channel.")
-        
-        return on_timeout
+    def _make_timeout_handler(self, inter: nextcord.Interaction, player: mafic.Player):
+        """Bind the shared select timeout handler to a guild and player.
+
+        Only the guild id and a weak reference to the player are captured, so
+        an abandoned search doesn't keep the Interaction (or a disconnected
+        player) alive for the full view timeout.
+        """
+        return functools.partial(self._on_select_timeout, guild_id=inter.guild_id, player_ref=weakref.ref(player))
+
+    async def _on_select_timeout(self, guild_id: int, player_ref):
+        """Shared timeout handler for track selection views."""
+        player = player_ref()
+        if player is None:
+            return
+        # Check if the player is still in use
+        if not player.current and player.connected:
+            if guild_id in self.bot.music_queues and not self.bot.music_queues[guild_id]:
+                await player.disconnect()
+                if guild_id in self.bot.text_channels:
+                    await self.bot.text_channels[guild_id].send("Search timed out. Disconnected from the voice channel.")
 
     @nextcord.slash_command(description="Play music or search for tracks", dm_permission=False, guild_ids=[config.DISCORD_GUILD])
     async def play(self, inter: nextcord.Interaction, query: str):
         """Play music from a query or URL."""
         if not inter.user.voice:
-            embed = nextcord.Embed(title="Error", color=nextcord.Color.red())
-            embed.add_field(name="Message", value="You need to be in a voice channel!", inline=False)
-            return await inter.send(embed=embed)
+            return await inter.send(embed=_NOT_IN_VC_EMBED)
         
         if inter.guild.voice_client and inter.guild.voice_client.channel != inter.user.voice.channel:
-            embed = nextcord.Embed(title="Error", color=nextcord.Color.red())
-            embed.add_field(name="Message", value="I'm already in a different voice channel. Please join my channel or use the stop command first.", inline=False)
-            return await inter.send(embed=embed)
+            return await inter.send(embed=_ALREADY_IN_VC_EMBED)
         
         self.bot.text_channels[inter.guild_id] = inter.channel
 
@@ -56,14 +83,14 @@ class Music(CogBase):
             try:
                 player = await inter.user.voice.channel.connect(cls=mafic.Player)
             except Exception as e:
-                embed = nextcord.Embed(title="Error", color=nextcord.Color.red())
+                embed = nextcord.Embed(title="Error", color=_RED)
                 embed.add_field(name="Message", value=f"Failed to connect to voice channel: {str(e)}", inline=False)
                 return await inter.send(embed=embed)
         else:
             player = inter.guild.voice_client
 
         if inter.guild_id not in self.bot.music_queues:
-            self.bot.music_queues[inter.guild_id] = deque()
+            self.bot.music_queues[inter.guild_id] = TrackQueue()
 
         try:
             if is_youtube_url(query):
@@ -71,19 +98,17 @@ class Music(CogBase):
             else:
                 results = await player.fetch_tracks(query, search_type=mafic.SearchType.YOUTUBE)
         except Exception as e:
-            embed = nextcord.Embed(title="Error", color=nextcord.Color.red())
+            embed = nextcord.Embed(title="Error", color=_RED)
             embed.add_field(name="Message", value=f"An error occurred while fetching tracks: {str(e)}", inline=False)
             return await inter.send(embed=embed)
 
         if not results:
-            embed = nextcord.Embed(title="No Results", color=nextcord.Color.yellow())
-            embed.add_field(name="Message", value="No tracks found.", inline=False)
-            return await inter.send(embed=embed)
+            return await inter.send(embed=_NO_RESULTS_EMBED)
 
         if isinstance(results, mafic.Playlist):
-            for track in results.tracks:
-                self.bot.music_queues[inter.guild_id].append(track)
-            embed = nextcord.Embed(title="Playlist Added", color=nextcord.Color.green())
+            # Bulk-extend instead of one append call per track
+            self.bot.music_queues[inter.guild_id].extend(results.tracks)
+            embed = nextcord.Embed(title="Playlist Added", color=_GREEN)
             embed.add_field(name="Playlist Name", value=results.name, inline=False)
             embed.add_field(name="Tracks Added", value=str(len(results.tracks)), inline=False)
             await inter.send(embed=embed)
@@ -92,7 +117,7 @@ class Music(CogBase):
         elif is_youtube_url(query) or len(results) == 1:
             track = results[0]
             self.bot.music_queues[inter.guild_id].append(track)
-            embed = nextcord.Embed(title="Track Added", color=nextcord.Color.green())
+            embed = nextcord.Embed(title="Track Added", color=_GREEN)
             embed.add_field(name="Title", value=track.title, inline=False)
             embed.add_field(name="Author", value=track.author, inline=False)
             await inter.send(embed=embed)
@@ -106,7 +131,7 @@ class Music(CogBase):
                 selected_index = int(select.values[0])
                 selected_track = results[selected_index]
                 self.bot.music_queues[interaction.guild_id].append(selected_track)
-                embed = nextcord.Embed(title="Track Added", color=nextcord.Color.green())
+                embed = nextcord.Embed(title="Track Added", color=_GREEN)
                 embed.add_field(name="Title", value=selected_track.title, inline=False)
                 embed.add_field(name="Author", value=selected_track.author, inline=False)
                 await interaction.response.send_message(embed=embed)
@@ -116,9 +141,9 @@ class Music(CogBase):
             select.callback = select_callback
             view = nextcord.ui.View(timeout=60)
             view.add_item(select)
-            view.on_timeout = await self.create_timeout_handler(inter, player)
+            view.on_timeout = self._make_timeout_handler(inter, player)
 
-            embed = nextcord.Embed(title="Track Selection", color=nextcord.Color.blue())
+            embed = nextcord.Embed(title="Track Selection", color=_BLUE)
             embed.add_field(name="Action", value="Please select a track to add to the queue:", inline=False)
             await inter.send(embed=embed, view=view)
 
@@ -126,14 +151,10 @@ class Music(CogBase):
     async def playnext(self, inter: nextcord.Interaction, query: str):
         """Play music from a query or URL at the front of the queue."""
         if not inter.user.voice:
-            embed = nextcord.Embed(title="Error", color=nextcord.Color.red())
-            embed.add_field(name="Message", value="You need to be in a voice channel!", inline=False)
-            return await inter.send(embed=embed)
+            return await inter.send(embed=_NOT_IN_VC_EMBED)
         
         if inter.guild.voice_client and inter.guild.voice_client.channel != inter.user.voice.channel:
-            embed = nextcord.Embed(title="Error", color=nextcord.Color.red())
-            embed.add_field(name="Message", value="I'm already in a different voice channel. Please join my channel or use the stop command first.", inline=False)
-            return await inter.send(embed=embed)
+            return await inter.send(embed=_ALREADY_IN_VC_EMBED)
         
         self.bot.text_channels[inter.guild_id] = inter.channel
 
@@ -141,14 +162,14 @@ class Music(CogBase):
             try:
                 player = await inter.user.voice.channel.connect(cls=mafic.Player)
             except Exception as e:
-                embed = nextcord.Embed(title="Error", color=nextcord.Color.red())
+                embed = nextcord.Embed(title="Error", color=_RED)
                 embed.add_field(name="Message", value=f"Failed to connect to voice channel: {str(e)}", inline=False)
                 return await inter.send(embed=embed)
         else:
             player = inter.guild.voice_client
 
         if inter.guild_id not in self.bot.music_queues:
-            self.bot.music_queues[inter.guild_id] = deque()
+            self.bot.music_queues[inter.guild_id] = TrackQueue()
 
         try:
             if is_youtube_url(query):
@@ -156,21 +177,21 @@ class Music(CogBase):
             else:
                 results = await player.fetch_tracks(query, search_type=mafic.SearchType.YOUTUBE)
         except Exception as e:
-            embed = nextcord.Embed(title="Error", color=nextcord.Color.red())
+            embed = nextcord.Embed(title="Error", color=_RED)
             embed.add_field(name="Message", value=f"An error occurred while fetching tracks: {str(e)}", inline=False)
             return await inter.send(embed=embed)
 
         if not results:
-            embed = nextcord.Embed(title="No Results", color=nextcord.Color.yellow())
-            embed.add_field(name="Message", value="No tracks found.", inline=False)
-            return await inter.send(embed=embed)
+            return await inter.send(embed=_NO_RESULTS_EMBED)
 
         if isinstance(results, mafic.Playlist):
-            for track in reversed(results.tracks):
-                self.bot.music_queues[inter.guild_id].appendleft(track)
-            embed = nextcord.Embed(title="Playlist Added", color=nextcord.Color.green())
+            # extendleft inserts each track at the front in turn, so feeding it
+            # the reversed list restores the playlist order at the head.
+            tracks = list(results.tracks)
+            self.bot.music_queues[inter.guild_id].extendleft(reversed(tracks))
+            embed = nextcord.Embed(title="Playlist Added", color=_GREEN)
             embed.add_field(name="Playlist Name", value=results.name, inline=False)
-            embed.add_field(name="Tracks Added", value=str(len(results.tracks)), inline=False)
+            embed.add_field(name="Tracks Added", value=str(len(tracks)), inline=False)
             embed.add_field(name="Position", value="Next in queue", inline=False)
             await inter.send(embed=embed)
             if inter.guild_id not in self.bot.current_song:
@@ -178,7 +199,7 @@ class Music(CogBase):
         elif is_youtube_url(query) or len(results) == 1:
             track = results[0]
             self.bot.music_queues[inter.guild_id].appendleft(track)
-            embed = nextcord.Embed(title="Track Added", color=nextcord.Color.green())
+            embed = nextcord.Embed(title="Track Added", color=_GREEN)
             embed.add_field(name="Title", value=track.title, inline=False)
             embed.add_field(name="Author", value=track.author, inline=False)
             embed.add_field(name="Position", value="Next in queue", inline=False)
@@ -193,7 +214,7 @@ class Music(CogBase):
                 selected_index = int(select.values[0])
                 selected_track = results[selected_index]
                 self.bot.music_queues[interaction.guild_id].appendleft(selected_track)
-                embed = nextcord.Embed(title="Track Added", color=nextcord.Color.green())
+                embed = nextcord.Embed(title="Track Added", color=_GREEN)
                 embed.add_field(name="Title", value=selected_track.title, inline=False)
                 embed.add_field(name="Author", value=selected_track.author, inline=False)
                 embed.add_field(name="Position", value="Next in queue", inline=False)
@@ -204,49 +225,50 @@ class Music(CogBase):
             select.callback = select_callback
             view = nextcord.ui.View(timeout=60)
             view.add_item(select)
-            view.on_timeout = await self.create_timeout_handler(inter, player)
+            view.on_timeout = self._make_timeout_handler(inter, player)
 
-            embed = nextcord.Embed(title="Track Selection", color=nextcord.Color.blue())
+            embed = nextcord.Embed(title="Track Selection", color=_BLUE)
             embed.add_field(name="Action", value="Please select a track to play next:", inline=False)
             await inter.send(embed=embed, view=view)
 
     @nextcord.slash_command(description="Stop the music and clear the queue", dm_permission=False, guild_ids=[config.DISCORD_GUILD])
     async def stop(self, inter: nextcord.Interaction):
         """Stop the music, clear the queue, and disconnect."""
-        if not inter.guild.voice_client or not isinstance(inter.guild.voice_client, mafic.Player):
-            embed = nextcord.Embed(title="Error", color=nextcord.Color.red())
+        player = _get_player(inter)
+        if player is None:
+            embed = nextcord.Embed(title="Error", color=_RED)
             embed.add_field(name="Message", value="I'm not playing anything right now.", inline=False)
             return await inter.send(embed=embed)
 
-        player = inter.guild.voice_client
         guild_id = inter.guild_id
         
         if player.connected:
             # Disable replay mode
             self.bot.replay_mode[guild_id] = False
             
-            if guild_id in self.bot.music_queues:
-                self.bot.music_queues[guild_id].clear()
+            queue = self.bot.music_queues.get(guild_id)
+            if queue is not None:
+                queue.clear()
             await player.stop()
             await player.disconnect()
             
-            embed = nextcord.Embed(title="Playback Stopped", color=nextcord.Color.blue())
+            embed = nextcord.Embed(title="Playback Stopped", color=_BLUE)
             embed.add_field(name="Action", value="Stopped the music, cleared the queue, and disconnected from the voice channel.", inline=False)
             embed.add_field(name="Replay Mode", value="Disabled", inline=False)
             
             await inter.send(embed=embed)
         else:
-            embed = nextcord.Embed(title="Error", color=nextcord.Color.red())
+            embed = nextcord.Embed(title="Error", color=_RED)
             embed.add_field(name="Message", value="The player is not connected to a voice channel.", inline=False)
             await inter.send(embed=embed)
 
     @nextcord.slash_command(description="Pause the current track", dm_permission=False, guild_ids=[config.DISCORD_GUILD])
     async def pause(self, inter: nextcord.Interaction):
         """Pause the current track."""
-        if not inter.guild.voice_client or not isinstance(inter.guild.voice_client, mafic.Player):
+        player = _get_player(inter)
+        if player is None:
             return await inter.send("I'm not playing anything right now.")
 
-        player = inter.guild.voice_client
         if player.connected and player.current:
             if player.paused:
                 return await inter.send("The player is already paused.")
@@ -258,10 +280,10 @@ class Music(CogBase):
     @nextcord.slash_command(description="Resume the paused track", dm_permission=False, guild_ids=[config.DISCORD_GUILD])
     async def resume(self, inter: nextcord.Interaction):
         """Resume the paused track."""
-        if not inter.guild.voice_client or not isinstance(inter.guild.voice_client, mafic.Player):
+        player = _get_player(inter)
+        if player is None:
             return await inter.send("I'm not playing anything right now.")
 
-        player = inter.guild.voice_client
         if player.connected and player.current:
             if not player.paused:
                 return await inter.send("The player is not paused.")
@@ -273,19 +295,13 @@ class Music(CogBase):
     @nextcord.slash_command(description="Skip the current track", dm_permission=False, guild_ids=[config.DISCORD_GUILD])
     async def skip(self, inter: nextcord.Interaction):
         """Skip the current track."""
-        if not inter.guild.voice_client or not isinstance(inter.guild.voice_client, mafic.Player):
+        player = _get_player(inter)
+        if player is None:
             return await inter.send("I'm not playing anything right now.")
 
-        player = inter.guild.voice_client
         if player.current:
-            guild_id = inter.guild_id
-            
-            # Temporarily add a flag to the bot to indicate this is a skip operation
-            if not hasattr(self.bot, 'skip_operations'):
-                self.bot.skip_operations = {}
-            
-            # Set this guild's skip flag to True
-            self.bot.skip_operations[guild_id] = True
+            # Flag this guild's track end as a skip operation
+            self.bot.skip_operations[inter.guild_id] = True
             
             # Stop the current track
             await player.stop()
@@ -298,10 +314,9 @@ class Music(CogBase):
     @nextcord.slash_command(description="Delete a specific track from the queue", dm_permission=False, guild_ids=[config.DISCORD_GUILD])
     async def delete_from_queue(self, inter: nextcord.Interaction):
         """Delete a specific track from the queue."""
-        if inter.guild_id not in self.bot.music_queues or not self.bot.music_queues[inter.guild_id]:
+        queue = self.bot.music_queues.get(inter.guild_id)
+        if not queue:
             return await inter.send("The queue is empty.")
-
-        queue = self.bot.music_queues[inter.guild_id]
         options = [
             nextcord.SelectOption(
                 label=f"{i+1}. {track.title[:50]}",
@@ -339,10 +354,10 @@ class Music(CogBase):
     @nextcord.slash_command(description="Show information about the currently playing track", dm_permission=False, guild_ids=[config.DISCORD_GUILD])
     async def now_playing(self, inter: nextcord.Interaction):
         """Show information about the currently playing track."""
-        if not inter.guild.voice_client or not isinstance(inter.guild.voice_client, mafic.Player):
+        player = _get_player(inter)
+        if player is None:
             return await inter.send("I'm not playing anything right now.")
 
-        player = inter.guild.voice_client
         if not player.current:
             return await inter.send("No track is currently playing.")
 
@@ -354,10 +369,11 @@ class Music(CogBase):
         # Check replay mode
         replay_mode = self.bot.replay_mode.get(guild_id, False)
 
-        embed = nextcord.Embed(title="Now Playing", color=nextcord.Color.blue())
+        embed = nextcord.Embed(title="Now Playing", color=_BLUE)
         embed.add_field(name="Title", value=track.title, inline=False)
         embed.add_field(name="Author", value=track.author, inline=False)
-        embed.add_field(name="Duration", value=f"{position} / {duration}", inline=False)
+        progress_bar = format_progress_bar(player.position, track.length)
+        embed.add_field(name="Duration", value=f"{progress_bar}\n{position} / {duration}", inline=False)
         
         if replay_mode:
             embed.add_field(name="Replay Mode", value="Enabled ♻️", inline=False)
@@ -370,10 +386,10 @@ class Music(CogBase):
     @nextcord.slash_command(description="Set the volume of the player", dm_permission=False, guild_ids=[config.DISCORD_GUILD])
     async def volume(self, inter: nextcord.Interaction, volume: int):
         """Set the volume of the player."""
-        if not inter.guild.voice_client or not isinstance(inter.guild.voice_client, mafic.Player):
+        player = _get_player(inter)
+        if player is None:
             return await inter.send("I'm not playing anything right now.")
 
-        player = inter.guild.voice_client
         if 0 <= volume <= 1000:
             await player.set_volume(volume)
             await inter.send(f"Set the volume to {volume}%")
@@ -383,18 +399,17 @@ class Music(CogBase):
     @nextcord.slash_command(description="Shuffle the current queue", dm_permission=False, guild_ids=[config.DISCORD_GUILD])
     async def shuffle(self, inter: nextcord.Interaction):
         """Shuffle the current queue."""
-        if inter.guild_id not in self.bot.music_queues or len(self.bot.music_queues[inter.guild_id]) < 2:
+        queue = self.bot.music_queues.get(inter.guild_id)
+        if not queue or len(queue) < 2:
             return await inter.send("The queue needs at least two tracks to shuffle.")
 
-        queue = self.bot.music_queues[inter.guild_id]
         
-        # Convert the deque to a list, shuffle it, and convert back to deque
-        queue_list = list(queue)
-        random.shuffle(queue_list)
-        self.bot.music_queues[inter.guild_id] = deque(queue_list)
+        # Shuffle in place; no copy out and rebuild
+        queue.shuffle()
+        queue_list = queue.snapshot()
 
         # Create an embed to display the shuffled queue
-        embed = nextcord.Embed(title="Queue Shuffled", color=nextcord.Color.green())
+        embed = nextcord.Embed(title="Queue Shuffled", color=_GREEN)
         
         # Display the current track (if any) and the first 10 tracks of the shuffled queue
         track_list = []
@@ -423,40 +438,42 @@ class Music(CogBase):
     @nextcord.slash_command(description="Show the current queue", dm_permission=False, guild_ids=[config.DISCORD_GUILD])
     async def queue(self, inter: nextcord.Interaction):
         """Show the current queue."""
-        if inter.guild_id not in self.bot.music_queues and inter.guild_id not in self.bot.current_song:
+        queue = self.bot.music_queues.get(inter.guild_id, ())
+        if not queue and inter.guild_id not in self.bot.current_song:
             return await inter.send("The queue is empty and no song is currently playing.")
 
-        embed = nextcord.Embed(title="Current Queue", color=nextcord.Color.blue())
+        embed = nextcord.Embed(title="Current Queue", color=_BLUE)
 
         # Add current track information
         current_track = self.bot.current_song.get(inter.guild_id)
         if current_track:
-            player = inter.guild.voice_client
-            if player and isinstance(player, mafic.Player):
+            player = _get_player(inter)
+            if player:
                 current_position = format_duration(player.position)
                 current_duration = format_duration(current_track.length)
                 embed.add_field(name="Now Playing", value=f"{current_track.title} - {current_track.author}\n"
                                                         f"Duration: {current_position} / {current_duration}", inline=False)
 
-        # Add queued tracks
-        queue = self.bot.music_queues.get(inter.guild_id, [])
-        track_list = []
-        total_duration = 0
-        for i, track in enumerate(queue):
-            duration = format_duration(track.length)
-            if i < 10:  # Show only first 10 tracks to avoid hitting Discord's character limit
-                track_list.append(f"{i+1}. {track.title} - {track.author} ({duration})")
-            total_duration += track.length
+        # Add queued tracks; the snapshot tuple is cached between queue
+        # mutations, so back-to-back /queue calls don't re-copy the queue
+        tracks = queue.snapshot() if queue else ()
+        # Show only first 10 tracks to avoid hitting Discord's character limit
+        track_list = [
+            f"{i+1}. {track.title} - {track.author} ({format_duration(track.length)})"
+            for i, track in enumerate(tracks[:10])
+        ]
+        # Maintained incrementally by the queue, so no per-track summing
+        total_duration = queue.total_length if queue else 0
 
         if track_list:
             embed.add_field(name="Next in Queue", value="\n".join(track_list), inline=False)
-            if len(queue) > 10:
-                embed.add_field(name="", value=f"And {len(queue) - 10} more...", inline=False)
+            if len(tracks) > 10:
+                embed.add_field(name="", value=f"And {len(tracks) - 10} more...", inline=False)
         else:
             embed.add_field(name="Next in Queue", value="No tracks in queue", inline=False)
 
         # Add total queue information
-        total_tracks = len(queue)
+        total_tracks = len(tracks)
         total_duration_formatted = format_duration(total_duration)
         embed.add_field(name="Queue Info", value=f"Total tracks in queue: {total_tracks}\n"
                                                 f"Total duration of queue: {total_duration_formatted}", inline=False)
@@ -470,7 +487,7 @@ class Music(CogBase):
         self.bot.recommendation_enabled[guild_id] = not self.bot.recommendation_enabled.get(guild_id, False)
         status = "enabled" if self.bot.recommendation_enabled[guild_id] else "disabled"
         
-        embed = nextcord.Embed(title="Recommendation Settings", color=nextcord.Color.blue())
+        embed = nextcord.Embed(title="Recommendation Settings", color=_BLUE)
         embed.add_field(name="Status", value=f"Automatic song recommendations are now {status}.", inline=False)
         
         await inter.send(embed=embed)
@@ -486,13 +503,11 @@ class Music(CogBase):
         status = "enabled" if self.bot.replay_mode[guild_id] else "disabled"
         
         # Check if there's a current song
-        current_song = None
-        if guild_id in self.bot.current_song:
-            current_song = self.bot.current_song[guild_id]
+        current_song = self.bot.current_song.get(guild_id)
         
         embed = nextcord.Embed(
             title="Replay Mode", 
-            color=nextcord.Color.green() if self.bot.replay_mode[guild_id] else nextcord.Color.red()
+            color=_GREEN if self.bot.replay_mode[guild_id] else _RED
         )
         
         embed.add_field(name="Status", value=f"Replay mode is now {status}.", inline=False)
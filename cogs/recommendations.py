@@ -1,12 +1,12 @@
 import nextcord
 from nextcord.ext import commands
 import mafic
-from utils import format_duration
-from collections import Counter
+from utils import format_duration, TrackQueue, batch_fetch_author_tracks
 import random
 import config
 
 from .cog_base import CogBase
+from bot.events import play_next
 
 class Recommendations(CogBase):
     """Music recommendation commands."""
@@ -32,31 +32,39 @@ class Recommendations(CogBase):
         
         await inter.response.defer()
         
-        # Get the most common authors from play history
-        author_counts = Counter(self.bot.play_history[guild_id])
-        common_authors = [author for author, _ in author_counts.most_common()]
-        
-        # Randomly select authors (or all if less than count)
-        num_authors = min(count, len(common_authors))
-        selected_authors = random.sample(common_authors, num_authors)
+        # Sample authors weighted by how often they appear in the history,
+        # so recommendations lean toward the user's most-played artists
+        author_counts = self.bot.play_history_counts[guild_id]
+        authors = list(author_counts.keys())
+        weights = list(author_counts.values())
+        if count >= len(authors):
+            # Fewer distinct authors than requested: take them all and
+            # skip the sampling loop entirely
+            selected_authors = authors
+        else:
+            selected_authors = []
+            picked = set()
+            while len(selected_authors) < count:
+                author = random.choices(authors, weights=weights, k=1)[0]
+                if author not in picked:
+                    picked.add(author)
+                    selected_authors.append(author)
         
+        # One batched round of concurrent searches over the shared connection
+        results_per_author = await batch_fetch_author_tracks(player, selected_authors)
+
         recommended_tracks = []
-        for author in selected_authors:
+        seen = set()  # (title, author) pairs already recommended
+        for results in results_per_author:
             if len(recommended_tracks) >= count:
                 break
-                
-            query = f"{author} music"
-            try:
-                results = await player.fetch_tracks(query, search_type=mafic.SearchType.YOUTUBE)
-                if results:
-                    # Find a track that's not already in recommended_tracks
-                    for track in results:
-                        track_id = (track.title, track.author)
-                        if not any(r.title == track.title and r.author == track.author for r in recommended_tracks):
-                            recommended_tracks.append(track)
-                            break
-            except Exception as e:
+            if isinstance(results, Exception) or not results:
                 continue
+            # First result that hasn't been recommended yet
+            track = next((t for t in results if (t.title, t.author) not in seen), None)
+            if track is not None:
+                seen.add((track.title, track.author))
+                recommended_tracks.append(track)
         
         if not recommended_tracks:
             if not inter.guild.voice_client or player.guild.id != guild_id:
@@ -81,10 +89,16 @@ class Recommendations(CogBase):
             selected_index = int(select.values[0])
             selected_track = recommended_tracks[selected_index]
             
-            if guild_id not in self.bot.music_queues:
-                self.bot.music_queues[guild_id] = []
-                
-            self.bot.music_queues[guild_id].append(selected_track)
+            queue = self.bot.music_queues.get(guild_id)
+            if queue is None:
+                queue = self.bot.music_queues[guild_id] = TrackQueue()
+            
+            # Don't let repeated recommendation picks pile up duplicates
+            track_id = (selected_track.title, selected_track.author)
+            if any((t.title, t.author) == track_id for t in queue):
+                return await interaction.response.send_message("That track is already in the queue.")
+            
+            queue.append(selected_track)
             
             embed = nextcord.Embed(title="Recommendation Added", color=nextcord.Color.green())
             embed.add_field(name="Title", value=selected_track.title, inline=False)
@@ -93,7 +107,6 @@ class Recommendations(CogBase):
             await interaction.response.send_message(embed=embed)
             
             if guild_id not in self.bot.current_song:
-                from bot.events import play_next
                 await play_next(self.bot, player)
         
         select.callback = select_callback
@@ -1,4 +1,5 @@
 import os
+import types
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -15,4 +16,13 @@ LAVALINK_PASSWORD = "youshallnotpass"
 LAVALINK_LABEL = "MAIN"
 
 # Music Configuration
-MAX_RECOMMENDATION_HISTORY = 100
\ No newline at end of file
+MAX_RECOMMENDATION_HISTORY = 100
+# Immutable snapshot of all config constants, computed once at import so
+# lookups don't rescan the module namespace.
+_CONFIG_SNAPSHOT = types.MappingProxyType(
+    {k: v for k, v in globals().items() if k.isupper() and not k.startswith('_')}
+)
+
+def get_config():
+    """Return a read-only mapping of all configuration constants."""
+    return _CONFIG_SNAPSHOT
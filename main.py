@@ -4,6 +4,7 @@ import os
 from dotenv import load_dotenv
 
 from bot import MusicBot
+from cogs import ALL_COGS
 
 # Load environment variables
 load_dotenv()
@@ -29,9 +30,11 @@ def main():
     bot = MusicBot(intents=intents)
     
     # Load cogs - no CharacterAI
-    bot.load_extension("cogs.music")
-    bot.load_extension("cogs.recommendations")
-    bot.load_extension("cogs.library") 
+    for cog in ALL_COGS:
+        try:
+            bot.load_extension(cog)
+        except Exception:
+            logging.exception("Failed to load extension %s", cog)
     
     # Start bot
     bot.run(os.getenv("DISCORD_BOT_TOKEN"))
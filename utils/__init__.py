@@ -1,5 +1,8 @@
-from .formatters import format_duration
+from .formatters import format_duration, format_progress_bar
 from .validators import is_youtube_url
 from .locks import MusicLock
 from .music_queue import MusicQueue
-from .library import LibraryManager
\ No newline at end of file
+from .track_queue import TrackQueue
+from .track_cache import fetch_author_tracks, batch_fetch_author_tracks
+from .library import LibraryManager
+from .library_db import SQLiteLibraryManager
\ No newline at end of file
@@ -9,10 +9,28 @@ def format_duration(duration_ms: int) -> str:
         str: Formatted duration string (HH:MM:SS or MM:SS)
     """
     seconds = duration_ms // 1000
-    minutes, seconds = divmod(seconds, 60)
-    hours, minutes = divmod(minutes, 60)
+    hours, rem = divmod(seconds, 3600)
+    minutes, seconds = divmod(rem, 60)
     
-    if hours > 0:
+    if hours:
         return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-    else:
-        return f"{minutes:02d}:{seconds:02d}"
\ No newline at end of file
+    return f"{minutes:02d}:{seconds:02d}"
+_BAR_LENGTH = 20
+# All possible bar renderings, precomputed so each refresh is a tuple index.
+_BARS = tuple("▓" * i + "░" * (_BAR_LENGTH - i) for i in range(_BAR_LENGTH + 1))
+
+def format_progress_bar(position_ms: int, duration_ms: int) -> str:
+    """
+    Render a playback progress bar for the current track.
+
+    Args:
+        position_ms (int): Current playback position in milliseconds
+        duration_ms (int): Track duration in milliseconds
+
+    Returns:
+        str: A fixed-width bar string like "▓▓▓▓░░░░░░░░░░░░░░░░"
+    """
+    if duration_ms <= 0:
+        return _BARS[0]
+    filled = min(_BAR_LENGTH, _BAR_LENGTH * position_ms // duration_ms)
+    return _BARS[filled]
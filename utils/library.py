@@ -1,24 +1,233 @@
+import codecs
 import json
+import mmap
 import os
 import logging
 from pathlib import Path
 import shutil
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib
+    orjson = None
+
+def _loads(data):
+    """Parse library JSON from a bytes-like object, preferring orjson."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()  # stdlib json can't parse a memoryview
+    return json.loads(data)
+
+def _dumps(libraries, pretty=False):
+    """Serialize libraries to bytes, preferring orjson.
+
+    The on-disk form is compact by default; whitespace roughly doubles
+    both the encode time and the bytes that have to reach the disk on
+    every save. Pass pretty=True when a human needs to read the file.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(libraries, option=option)
+    if pretty:
+        return json.dumps(libraries, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(libraries, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def _dumps_op(op):
+    """Serialize a journal op to one compact line (no embedded newlines)."""
+    if orjson is not None:
+        return orjson.dumps(op)
+    return json.dumps(op, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
 class LibraryManager:
     """Manages music libraries for users."""
     
-    def __init__(self, storage_dir="libraries"):
+    def __init__(self, storage_dir="libraries", pretty=False):
         """Initialize the library manager.
         
         Args:
             storage_dir: Directory to store library files
+            pretty: Indent saved files for human inspection (debug only)
         """
         self.storage_dir = storage_dir
+        self.pretty = pretty
         os.makedirs(storage_dir, exist_ok=True)
+        # Parsed libraries per guild, valid while the file mtime matches
+        self._cache = {}
+        self._cache_mtime_ns = {}
+        # Lazily built per-library URI sets for O(1) duplicate checks
+        self._uri_sets = {}
+        # Ops appended to each guild's journal since the last snapshot
+        self._journal_ops = {}
+        # Computed file paths; guild ids recur constantly and the
+        # f-string + join otherwise re-run on every call
+        self._path_cache = {}
     
+    # Files larger than this are parsed straight out of the page cache
+    # via mmap instead of being copied into a Python bytes object first.
+    _MMAP_THRESHOLD = 256 * 1024
+
+    @classmethod
+    def _read_and_parse(cls, path):
+        """Read and parse a library file, mmap-ing large ones."""
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size > cls._MMAP_THRESHOLD:
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except OSError:
+                    pass  # Fall back to a plain read
+                else:
+                    try:
+                        view = memoryview(mm)
+                        try:
+                            return _loads(view)
+                        finally:
+                            view.release()
+                    finally:
+                        mm.close()
+            return _loads(f.read())
+
+    # A journal past either bound is compacted into the snapshot file.
+    _JOURNAL_MAX_BYTES = 1024 * 1024
+    _JOURNAL_MAX_OPS = 1000
+
     def _get_library_path(self, guild_id):
         """Get the path to a guild's library file."""
-        return os.path.join(self.storage_dir, f"library_{guild_id}.json")
+        path = self._path_cache.get(guild_id)
+        if path is None:
+            path = self._path_cache[guild_id] = os.path.join(
+                self.storage_dir, f"library_{guild_id}.json")
+        return path
+
+    def _get_journal_path(self, guild_id):
+        """Get the path to a guild's mutation journal."""
+        return self._get_library_path(guild_id) + ".jrn"
+
+    def _get_meta_path(self, guild_id):
+        """Get the path to a guild's {name: count} sidecar."""
+        return self._get_library_path(guild_id) + ".meta"
+
+    def _write_meta(self, guild_id, libraries):
+        """Write the track-count sidecar; best effort, it can be rebuilt."""
+        meta_path = self._get_meta_path(guild_id)
+        temp_path = meta_path + ".tmp"
+        counts = {name: len(tracks) for name, tracks in libraries.items()}
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(_dumps_op(counts))
+            os.replace(temp_path, meta_path)
+        except OSError as e:
+            logging.debug(f"Could not write library meta for guild {guild_id}: {e}")
+
+    def _append_journal(self, guild_id, libraries, op):
+        """Record one mutation in the guild's append-only journal.
+
+        Single-track changes land as an O(delta) append instead of a full
+        snapshot rewrite; the journal is compacted into the snapshot once
+        it grows past the size or op-count bounds.
+
+        Args:
+            guild_id: ID of the guild
+            libraries: The guild's (already mutated) libraries dict
+            op: The journal op describing the mutation
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        journal_path = self._get_journal_path(guild_id)
+        try:
+            with open(journal_path, 'ab') as f:
+                if f.tell() == 0:
+                    # New journal: record which snapshot generation it
+                    # extends, so a stale journal that survives a
+                    # compaction can never replay onto the wrong snapshot
+                    f.write(_dumps_op({"snap": self._snapshot_generation(guild_id)}) + b"\n")
+                f.write(_dumps_op(op) + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+            size = os.path.getsize(journal_path)
+        except OSError as e:
+            logging.error(f"Error appending journal for guild {guild_id}: {e}")
+            # Fall back to a full snapshot write
+            return self.save_libraries(guild_id, libraries)
+
+        self._journal_ops[guild_id] = self._journal_ops.get(guild_id, 0) + 1
+        if (self._journal_ops[guild_id] >= self._JOURNAL_MAX_OPS
+                or size >= self._JOURNAL_MAX_BYTES):
+            return self.save_libraries(guild_id, libraries)
+        self._write_meta(guild_id, libraries)
+        return True
+
+    def _snapshot_generation(self, guild_id):
+        """Identify the current snapshot file by its mtime_ns."""
+        try:
+            return os.stat(self._get_library_path(guild_id)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _discard_journal(self, guild_id):
+        """Remove a guild's journal and forget its op count."""
+        self._journal_ops.pop(guild_id, None)
+        try:
+            os.remove(self._get_journal_path(guild_id))
+        except FileNotFoundError:
+            pass
+
+    def _replay_journal(self, guild_id, libraries, generation):
+        """Apply any journaled mutations on top of a loaded snapshot.
+
+        Args:
+            guild_id: ID of the guild
+            libraries: The freshly parsed snapshot to mutate
+            generation: mtime_ns of the snapshot the caller just read
+        """
+        try:
+            with open(self._get_journal_path(guild_id), 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        ops = 0
+        header_checked = False
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                op = _loads(line)
+            except ValueError:
+                # A torn final line means a crash mid-append; ignore it
+                logging.warning(f"Dropping truncated journal entry for guild {guild_id}")
+                break
+            if not header_checked:
+                header_checked = True
+                # First line must name the snapshot this journal extends;
+                # a mismatch means the ops were already compacted into a
+                # newer snapshot and replaying them would double-apply
+                if op.get("snap") != generation or generation is None:
+                    logging.warning(f"Discarding stale journal for guild {guild_id}")
+                    self._discard_journal(guild_id)
+                    return
+                continue
+            self._apply_op(libraries, op)
+            ops += 1
+        self._journal_ops[guild_id] = ops
+
+    @staticmethod
+    def _apply_op(libraries, op):
+        """Apply a single journal op to a libraries dict."""
+        kind = op.get("op")
+        library_name = op.get("lib")
+        if kind == "create":
+            libraries.setdefault(library_name, [])
+        elif kind == "delete":
+            libraries.pop(library_name, None)
+        elif kind == "add":
+            if library_name in libraries:
+                libraries[library_name].append(op.get("track"))
+        elif kind == "remove":
+            tracks = libraries.get(library_name)
+            index = op.get("index", -1)
+            if tracks is not None and 0 <= index < len(tracks):
+                tracks.pop(index)
     
     def get_libraries(self, guild_id):
         """Get all libraries for a guild.
@@ -27,29 +236,62 @@ class LibraryManager:
             dict: Libraries and their tracks
         """
         path = self._get_library_path(guild_id)
-        if not os.path.exists(path):
+        
+        # Serve from memory while the on-disk file is unchanged, so
+        # back-to-back library commands don't re-read and re-parse it.
+        # The stat doubles as the existence check: no preflight syscall.
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
             return {}
+        except OSError:
+            mtime_ns = None
+        if mtime_ns is not None and self._cache_mtime_ns.get(guild_id) == mtime_ns:
+            return self._cache[guild_id]
             
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            libraries = self._read_and_parse(path)
+            self._replay_journal(guild_id, libraries, mtime_ns)
+            self._cache[guild_id] = libraries
+            if mtime_ns is not None:
+                self._cache_mtime_ns[guild_id] = mtime_ns
+            self._uri_sets.pop(guild_id, None)  # Rebuild against the fresh data
+            return libraries
+        except ValueError as e:
             logging.error(f"Error decoding library file for guild {guild_id}: {e}")
             
             # Try to recover the file - create backup and start with empty library
             backup_path = path + ".bak"
             try:
-                if os.path.exists(backup_path):
+                try:
                     os.remove(backup_path)  # Remove old backup if exists
-                shutil.copy2(path, backup_path)  # Create backup of corrupted file
+                except FileNotFoundError:
+                    pass
+                # A hardlink preserves the corrupted bytes for free; the
+                # rewrite below creates a fresh inode at path, so the
+                # backup keeps pointing at the original data
+                try:
+                    os.link(path, backup_path)
+                except OSError:
+                    shutil.copy2(path, backup_path)  # Filesystem without hardlinks
                 logging.info(f"Created backup of corrupted library file: {backup_path}")
                 
-                # Create a new empty library file
+                # Create a new empty library file. Write through a temp +
+                # replace so path gets a fresh inode; truncating in place
+                # would clobber the hardlinked backup too.
                 empty_libraries = {}
-                with open(path, 'w', encoding='utf-8') as f:
-                    json.dump(empty_libraries, f, indent=2, ensure_ascii=False)
+                temp_path = path + ".tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(_dumps(empty_libraries))
+                os.replace(temp_path, path)
                 logging.info(f"Created new empty library file for guild {guild_id}")
                 
+                # The journal and meta sidecars described the corrupted
+                # snapshot; drop and rewrite them so all three files
+                # agree on the recovered (empty) state
+                self._discard_journal(guild_id)
+                self._write_meta(guild_id, empty_libraries)
+                
                 return empty_libraries
             except Exception as backup_error:
                 logging.error(f"Failed to create backup or new file: {backup_error}")
@@ -70,26 +312,90 @@ class LibraryManager:
         # Create a temporary file first
         temp_path = path + ".tmp"
         try:
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(libraries, f, indent=2, ensure_ascii=False)
-                
-            # If successful, rename the temp file to the actual file
-            if os.path.exists(path):
+            payload = _dumps(libraries, pretty=self.pretty)
+            if not self._write_via_tmpfile(path, payload):
+                # Portable fallback: named temp file, then rename over
+                # the real one (os.replace handles fresh and overwrite)
+                with open(temp_path, 'wb') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
                 os.replace(temp_path, path)
-            else:
-                os.rename(temp_path, path)
+            
+            # Persist the rename itself; without a directory fsync a crash
+            # can leave the replace unrecorded, or recorded with empty
+            # contents, on journaled filesystems.
+            if hasattr(os, 'O_DIRECTORY'):  # Not available on Windows
+                dir_fd = os.open(self.storage_dir, os.O_DIRECTORY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            
+            # The snapshot now contains every journaled op
+            self._journal_ops.pop(guild_id, None)
+            try:
+                os.remove(self._get_journal_path(guild_id))
+            except FileNotFoundError:
+                pass
+            
+            # Write-through: the saved dict becomes the cached copy
+            self._cache[guild_id] = libraries
+            try:
+                self._cache_mtime_ns[guild_id] = os.stat(path).st_mtime_ns
+            except OSError:
+                self._cache_mtime_ns.pop(guild_id, None)
+            self._write_meta(guild_id, libraries)
                 
             return True
         except Exception as e:
             logging.error(f"Error saving library for guild {guild_id}: {e}")
+            # The cached dict may have been mutated by the caller; drop it
+            # so the next read reflects what's actually on disk
+            self._cache.pop(guild_id, None)
+            self._cache_mtime_ns.pop(guild_id, None)
+            self._uri_sets.pop(guild_id, None)
             # Clean up temp file if it exists
-            if os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except:
-                    pass
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
             return False
     
+    def _write_via_tmpfile(self, path, payload):
+        """Write payload to path through an anonymous O_TMPFILE inode.
+
+        The data has no directory entry until it is complete and fsynced,
+        so a crash mid-write cannot leave a stale .tmp file behind.
+
+        Returns:
+            bool: True if written, False if O_TMPFILE is unavailable
+        """
+        if not hasattr(os, 'O_TMPFILE'):
+            return False  # Non-Linux platform
+        try:
+            fd = os.open(self.storage_dir, os.O_TMPFILE | os.O_WRONLY | os.O_CLOEXEC, 0o644)
+        except OSError:
+            return False  # Filesystem or kernel without O_TMPFILE support
+        temp_path = path + ".tmp"
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+            # Give the finished inode a name, then move it into place
+            try:
+                try:
+                    os.link(f"/proc/self/fd/{f.fileno()}", temp_path)
+                except FileExistsError:
+                    os.remove(temp_path)  # Stale temp from an older crash
+                    os.link(f"/proc/self/fd/{f.fileno()}", temp_path)
+            except OSError:
+                # linkat via /proc refused (container/overlay fs); the
+                # anonymous inode just vanishes on close
+                return False
+        os.replace(temp_path, path)
+        return True
+
     def create_library(self, guild_id, library_name):
         """Create a new library for a guild.
         
@@ -109,8 +415,11 @@ class LibraryManager:
         # Create new library
         libraries[library_name] = []
         
-        # Save libraries
-        return self.save_libraries(guild_id, libraries)
+        if not os.path.exists(self._get_library_path(guild_id)):
+            # First library for this guild: write the snapshot so the
+            # journal has a base file to replay against
+            return self.save_libraries(guild_id, libraries)
+        return self._append_journal(guild_id, libraries, {"op": "create", "lib": library_name})
     
     def delete_library(self, guild_id, library_name):
         """Delete a library.
@@ -130,9 +439,12 @@ class LibraryManager:
         
         # Delete library
         del libraries[library_name]
+        guild_sets = self._uri_sets.get(guild_id)
+        if guild_sets:
+            guild_sets.pop(library_name, None)
         
-        # Save libraries
-        return self.save_libraries(guild_id, libraries)
+        # Record the deletion
+        return self._append_journal(guild_id, libraries, {"op": "delete", "lib": library_name})
     
     def add_track(self, guild_id, library_name, track_data):
         """Add a track to a library.
@@ -154,15 +466,30 @@ class LibraryManager:
         # Check if track already exists in the library (by URI)
         track_uri = track_data.get('uri')
         if track_uri:
-            for existing_track in libraries[library_name]:
-                if existing_track.get('uri') == track_uri:
-                    return False  # Track already exists
+            uri_set = self._get_uri_set(guild_id, library_name, libraries)
+            if track_uri in uri_set:
+                return False  # Track already exists
         
         # Add track to library
         libraries[library_name].append(track_data)
         
-        # Save libraries
-        return self.save_libraries(guild_id, libraries)
+        # Record the addition
+        if not self._append_journal(guild_id, libraries,
+                                    {"op": "add", "lib": library_name, "track": track_data}):
+            return False
+        if track_uri:
+            uri_set.add(track_uri)
+        return True
+
+    def _get_uri_set(self, guild_id, library_name, libraries):
+        """Get (building on first use) the set of track URIs in a library."""
+        guild_sets = self._uri_sets.setdefault(guild_id, {})
+        uri_set = guild_sets.get(library_name)
+        if uri_set is None:
+            uri_set = guild_sets[library_name] = {
+                track.get('uri') for track in libraries[library_name] if track.get('uri')
+            }
+        return uri_set
     
     def remove_track(self, guild_id, library_name, track_index):
         """Remove a track from a library.
@@ -186,10 +513,18 @@ class LibraryManager:
             return False
         
         # Remove track from library
-        libraries[library_name].pop(track_index)
+        removed = libraries[library_name].pop(track_index)
         
-        # Save libraries
-        return self.save_libraries(guild_id, libraries)
+        # Record the removal
+        if not self._append_journal(guild_id, libraries,
+                                    {"op": "remove", "lib": library_name, "index": track_index}):
+            return False
+        removed_uri = removed.get('uri')
+        if removed_uri:
+            guild_sets = self._uri_sets.get(guild_id)
+            if guild_sets and library_name in guild_sets:
+                guild_sets[library_name].discard(removed_uri)
+        return True
     
     def get_library(self, guild_id, library_name):
         """Get tracks from a library.
@@ -218,9 +553,48 @@ class LibraryManager:
         Returns:
             dict: Dict of library names and track counts
         """
-        libraries = self.get_libraries(guild_id)
+        # Hot cache: counting the already-parsed dict is cheap and exact
+        libraries = self._cache.get(guild_id)
+        if libraries is not None:
+            return {name: len(tracks) for name, tracks in libraries.items()}
+        
+        # Cold: the sidecar answers in O(libraries) without parsing every
+        # track in the full file
+        try:
+            with open(self._get_meta_path(guild_id), 'rb') as f:
+                meta = _loads(f.read())
+            if isinstance(meta, dict):
+                return meta
+        except (OSError, ValueError):
+            pass
         
-        return {name: len(tracks) for name, tracks in libraries.items()}
+        libraries = self.get_libraries(guild_id)
+        counts = {name: len(tracks) for name, tracks in libraries.items()}
+        if libraries:
+            self._write_meta(guild_id, libraries)
+        return counts
+    
+    def iter_guilds(self):
+        """Iterate over guilds that have a library file on disk.
+
+        One scandir pass replaces a stat-per-guild probe, so sharded or
+        multi-guild callers can enumerate libraries cheaply.
+
+        Yields:
+            tuple: (guild_id, path) for each guild's library file
+        """
+        with os.scandir(self.storage_dir) as it:
+            for entry in it:
+                name = entry.name
+                if (entry.is_file(follow_symlinks=False)
+                        and name.startswith('library_') and name.endswith('.json')):
+                    try:
+                        guild_id = int(name[len('library_'):-len('.json')])
+                    except ValueError:
+                        continue
+                    # scandir already resolved the path; prime the cache
+                    self._path_cache.setdefault(guild_id, entry.path)
+                    yield guild_id, entry.path
     
     def fix_corrupted_library(self, guild_id):
         """Attempt to fix a corrupted library file by trying various encoding methods.
@@ -232,22 +606,31 @@ class LibraryManager:
             bool: True if successful, False otherwise
         """
         path = self._get_library_path(guild_id)
-        if not os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
             return False
-            
-        # Try different encoding methods
-        encodings = ['utf-8', 'latin1', 'cp1252', 'ascii']
+        
+        # Read the bytes once and try the encoding candidates in memory
+        # instead of re-opening and re-reading the file per attempt. A BOM
+        # pins the encoding outright, so honor it first.
+        if raw.startswith(codecs.BOM_UTF8):
+            encodings = ['utf-8-sig']
+        elif raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            encodings = ['utf-16']
+        else:
+            encodings = ['utf-8', 'latin1', 'cp1252']
         
         for encoding in encodings:
             try:
-                with open(path, 'r', encoding=encoding) as f:
-                    libraries = json.load(f)
-                
-                # If we get here, we successfully decoded the file
-                # Save it back with proper utf-8 encoding
-                return self.save_libraries(guild_id, libraries)
-            except:
+                # orjson parses UTF-8 bytes directly; other encodings
+                # decode in memory first
+                libraries = _loads(raw if encoding == 'utf-8' else raw.decode(encoding))
+            except (UnicodeDecodeError, ValueError):
                 continue
+            # Successfully decoded; save it back with proper utf-8 encoding
+            return self.save_libraries(guild_id, libraries)
                 
         # If all encodings fail, create a new empty file
         logging.warning(f"All encoding recovery attempts failed for guild {guild_id}, creating new empty library")
@@ -0,0 +1,209 @@
+import json
+import logging
+import sqlite3
+
+class SQLiteLibraryManager:
+    """Manages music libraries in a single SQLite database.
+
+    Drop-in replacement for the JSON-file LibraryManager: it exposes the
+    same public API, but a single-track mutation is an indexed INSERT or
+    DELETE instead of re-reading and rewriting a guild's whole library
+    file, and SQLite's WAL journal handles crash safety.
+    """
+
+    def __init__(self, db_path="libraries.db"):
+        """Initialize the library database.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS libraries ("
+            " guild_id INTEGER NOT NULL,"
+            " name TEXT NOT NULL,"
+            " PRIMARY KEY (guild_id, name))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tracks ("
+            " guild_id INTEGER NOT NULL,"
+            " library_name TEXT NOT NULL,"
+            " pos INTEGER NOT NULL,"
+            " track_json TEXT NOT NULL,"
+            " uri TEXT)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tracks_lib"
+            " ON tracks (guild_id, library_name, pos)"
+        )
+
+    def get_libraries(self, guild_id):
+        """Get all libraries for a guild.
+
+        Returns:
+            dict: Libraries and their tracks
+        """
+        libraries = {
+            name: [] for (name,) in self._conn.execute(
+                "SELECT name FROM libraries WHERE guild_id = ?", (guild_id,))
+        }
+        rows = self._conn.execute(
+            "SELECT library_name, track_json FROM tracks"
+            " WHERE guild_id = ? ORDER BY library_name, pos",
+            (guild_id,))
+        for library_name, track_json in rows:
+            libraries.setdefault(library_name, []).append(json.loads(track_json))
+        return libraries
+
+    def save_libraries(self, guild_id, libraries):
+        """Replace all libraries for a guild.
+
+        Args:
+            guild_id: ID of the guild
+            libraries: Dict of libraries and their tracks
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.execute("DELETE FROM tracks WHERE guild_id = ?", (guild_id,))
+                self._conn.execute("DELETE FROM libraries WHERE guild_id = ?", (guild_id,))
+                for name, tracks in libraries.items():
+                    self._conn.execute(
+                        "INSERT INTO libraries (guild_id, name) VALUES (?, ?)",
+                        (guild_id, name))
+                    self._conn.executemany(
+                        "INSERT INTO tracks (guild_id, library_name, pos, track_json, uri)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        [(guild_id, name, pos, json.dumps(track, ensure_ascii=False), track.get('uri'))
+                         for pos, track in enumerate(tracks)])
+            return True
+        except sqlite3.Error as e:
+            logging.error("Error saving libraries for guild %s: %s", guild_id, e)
+            return False
+
+    def create_library(self, guild_id, library_name):
+        """Create a new library for a guild.
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            self._conn.execute(
+                "INSERT INTO libraries (guild_id, name) VALUES (?, ?)",
+                (guild_id, library_name))
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def delete_library(self, guild_id, library_name):
+        """Delete a library.
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        with self._conn:
+            # Autocommit connection: BEGIN explicitly so both deletes
+            # land in one transaction
+            self._conn.execute("BEGIN")
+            cursor = self._conn.execute(
+                "DELETE FROM libraries WHERE guild_id = ? AND name = ?",
+                (guild_id, library_name))
+            self._conn.execute(
+                "DELETE FROM tracks WHERE guild_id = ? AND library_name = ?",
+                (guild_id, library_name))
+        return cursor.rowcount > 0
+
+    def add_track(self, guild_id, library_name, track_data):
+        """Add a track to a library.
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        exists = self._conn.execute(
+            "SELECT 1 FROM libraries WHERE guild_id = ? AND name = ?",
+            (guild_id, library_name)).fetchone()
+        if not exists:
+            return False
+
+        track_uri = track_data.get('uri')
+        if track_uri:
+            duplicate = self._conn.execute(
+                "SELECT 1 FROM tracks WHERE guild_id = ? AND library_name = ?"
+                " AND uri = ? LIMIT 1",
+                (guild_id, library_name, track_uri)).fetchone()
+            if duplicate:
+                return False  # Track already exists
+
+        self._conn.execute(
+            "INSERT INTO tracks (guild_id, library_name, pos, track_json, uri)"
+            " SELECT ?, ?, COALESCE(MAX(pos) + 1, 0), ?, ?"
+            " FROM tracks WHERE guild_id = ? AND library_name = ?",
+            (guild_id, library_name, json.dumps(track_data, ensure_ascii=False),
+             track_uri, guild_id, library_name))
+        return True
+
+    def remove_track(self, guild_id, library_name, track_index):
+        """Remove a track from a library by position.
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        with self._conn:
+            # Autocommit connection: BEGIN explicitly so the delete and
+            # the position shift land in one transaction
+            self._conn.execute("BEGIN")
+            cursor = self._conn.execute(
+                "DELETE FROM tracks WHERE guild_id = ? AND library_name = ?"
+                " AND pos = ?",
+                (guild_id, library_name, track_index))
+            if cursor.rowcount == 0:
+                return False
+            self._conn.execute(
+                "UPDATE tracks SET pos = pos - 1 WHERE guild_id = ?"
+                " AND library_name = ? AND pos > ?",
+                (guild_id, library_name, track_index))
+        return True
+
+    def get_library(self, guild_id, library_name):
+        """Get tracks from a library.
+
+        Returns:
+            list: Tracks in the library, or None if it doesn't exist
+        """
+        exists = self._conn.execute(
+            "SELECT 1 FROM libraries WHERE guild_id = ? AND name = ?",
+            (guild_id, library_name)).fetchone()
+        if not exists:
+            return None
+        rows = self._conn.execute(
+            "SELECT track_json FROM tracks WHERE guild_id = ?"
+            " AND library_name = ? ORDER BY pos",
+            (guild_id, library_name))
+        return [json.loads(track_json) for (track_json,) in rows]
+
+    def list_libraries(self, guild_id):
+        """List all libraries for a guild.
+
+        Returns:
+            dict: Dict of library names and track counts
+        """
+        counts = {
+            name: 0 for (name,) in self._conn.execute(
+                "SELECT name FROM libraries WHERE guild_id = ?", (guild_id,))
+        }
+        rows = self._conn.execute(
+            "SELECT library_name, COUNT(*) FROM tracks WHERE guild_id = ?"
+            " GROUP BY library_name",
+            (guild_id,))
+        counts.update(dict(rows))
+        return counts
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
@@ -1,3 +1,4 @@
+import weakref
 from asyncio import Lock
 
 class MusicLock:
@@ -5,18 +6,22 @@ class MusicLock:
     A class to manage locks for music-related operations.
     """
     def __init__(self):
-        self.locks = {}
-    
+        # Weak values: a guild's lock is collected once no coroutine holds
+        # it, so the mapping stays bounded no matter how many guilds pass
+        # through. Callers keep a strong reference for the critical section.
+        self.locks = weakref.WeakValueDictionary()
+
     def get_lock(self, guild_id):
         """
         Get a lock for a specific guild.
-        
+
         Args:
             guild_id: The ID of the guild
-            
+
         Returns:
             Lock: An asyncio Lock for the guild
         """
-        if guild_id not in self.locks:
-            self.locks[guild_id] = Lock()
-        return self.locks[guild_id]
\ No newline at end of file
+        lock = self.locks.get(guild_id)
+        if lock is None:
+            lock = self.locks[guild_id] = Lock()
+        return lock
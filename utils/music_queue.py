@@ -79,8 +79,12 @@ class MusicQueue:
         """
         queue = self.get_queue(guild_id)
         if 0 <= index < len(queue):
-            track = queue[index]
-            del queue[index]
+            # Rotate the target to the front, pop it, rotate back: pure
+            # pointer updates inside the deque instead of indexed access
+            # plus deletion, each of which walks the blocks from an end
+            queue.rotate(-index)
+            track = queue.popleft()
+            queue.rotate(index)
             return track
         return None
     
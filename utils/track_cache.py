@@ -0,0 +1,82 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+import mafic
+
+# Author searches are deterministic "<author> music" queries, so results
+# can be shared across guilds for a while instead of hitting Lavalink on
+# every recommendation pass.
+_MAXSIZE = 512
+_TTL_SECONDS = 600
+
+_cache = OrderedDict()  # author_lower -> (expires_at, results)
+_locks = {}  # author_lower -> asyncio.Lock for in-flight fetches
+
+async def fetch_author_tracks(player, author):
+    """
+    Search for an author's tracks, caching results with an LRU + TTL policy.
+
+    Concurrent misses for the same author coalesce into a single upstream
+    fetch via a per-key lock.
+
+    Args:
+        player: The mafic.Player (or node) to search with
+        author: The author name to search for
+
+    Returns:
+        The track results from Lavalink (possibly cached)
+    """
+    key = author.lower()
+    entry = _cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        _cache.move_to_end(key)
+        return entry[1]
+
+    lock = _locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            # Another task may have filled the cache while we waited
+            entry = _cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+
+            results = await player.fetch_tracks(f"{author} music", search_type=mafic.SearchType.YOUTUBE)
+            _cache[key] = (time.monotonic() + _TTL_SECONDS, results)
+            _cache.move_to_end(key)
+            while len(_cache) > _MAXSIZE:
+                _cache.popitem(last=False)
+            return results
+    finally:
+        # Drop the lock entry whether the fetch succeeded or raised, so
+        # failing authors can't grow _locks without bound; only the
+        # entry we registered, in case a later caller already re-created it
+        if _locks.get(key) is lock:
+            del _locks[key]
+
+# Cap on concurrent Lavalink searches issued by a single batch.
+_BATCH_CONCURRENCY = 4
+
+async def batch_fetch_author_tracks(player, authors):
+    """
+    Fetch searches for several authors over the shared player connection.
+
+    All requests go out concurrently (bounded by _BATCH_CONCURRENCY) and
+    through the author cache, so a batch costs at most one round-trip per
+    uncached author rather than one sequential await each.
+
+    Args:
+        player: The mafic.Player (or node) to search with
+        authors: Iterable of author names
+
+    Returns:
+        list: One entry per author, either the track results or the
+            exception raised while fetching them
+    """
+    semaphore = asyncio.Semaphore(_BATCH_CONCURRENCY)
+
+    async def fetch(author):
+        async with semaphore:
+            return await fetch_author_tracks(player, author)
+
+    return await asyncio.gather(*(fetch(author) for author in authors), return_exceptions=True)
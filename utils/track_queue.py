@@ -0,0 +1,143 @@
+import random
+from itertools import islice
+
+def _length(track):
+    """Duration of a track in ms, 0 for objects without one."""
+    return getattr(track, 'length', 0) or 0
+
+class TrackQueue:
+    """
+    A FIFO queue of tracks backed by a list with a head index.
+
+    collections.deque is fast at both ends but pays O(n) for queue[i] and
+    del queue[i], which the queue display and delete_from_queue rely on.
+    A plain list with a head pointer keeps popleft amortized O(1) while
+    indexing and mid-queue deletion stay cheap.
+    """
+
+    # Compact once the dead prefix outgrows the live items so memory
+    # stays proportional to the queue length.
+    _COMPACT_THRESHOLD = 64
+
+    def __init__(self, iterable=()):
+        self._items = list(iterable)
+        self._head = 0
+        # Bumped on every mutation so cached snapshots can be validated
+        self._version = 0
+        self._snapshot = None  # (version, tuple of tracks)
+        # Total duration maintained by delta on every mutation, so
+        # summing the queue is never needed at display time
+        self._total_length = sum(_length(t) for t in self._items)
+
+    def _index(self, index):
+        """Translate a queue index (may be negative) to a list index."""
+        length = len(self._items) - self._head
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("queue index out of range")
+        return self._head + index
+
+    def append(self, track):
+        """Add a track to the end of the queue."""
+        self._items.append(track)
+        self._version += 1
+        self._total_length += _length(track)
+
+    def appendleft(self, track):
+        """Add a track to the front of the queue."""
+        self._version += 1
+        self._total_length += _length(track)
+        if self._head:
+            self._head -= 1
+            self._items[self._head] = track
+        else:
+            self._items.insert(0, track)
+
+    def extend(self, tracks):
+        """Add multiple tracks to the end of the queue."""
+        tracks = list(tracks)
+        self._items.extend(tracks)
+        self._version += 1
+        self._total_length += sum(_length(t) for t in tracks)
+
+    def extendleft(self, tracks):
+        """Add multiple tracks to the front of the queue.
+
+        Like deque.extendleft, each track lands at the front in turn, so
+        the sequence ends up reversed at the front of the queue. The
+        whole batch goes in as one list splice rather than k inserts.
+        """
+        tracks = list(tracks)
+        tracks.reverse()
+        self._items[self._head:self._head] = tracks
+        self._version += 1
+        self._total_length += sum(_length(t) for t in tracks)
+
+    def popleft(self):
+        """Remove and return the track at the front of the queue."""
+        if self._head >= len(self._items):
+            raise IndexError("pop from an empty queue")
+        self._version += 1
+        track = self._items[self._head]
+        self._total_length -= _length(track)
+        self._items[self._head] = None  # Drop the reference
+        self._head += 1
+        if self._head >= self._COMPACT_THRESHOLD and self._head * 2 >= len(self._items):
+            del self._items[:self._head]
+            self._head = 0
+        return track
+
+    def clear(self):
+        """Remove all tracks from the queue."""
+        self._version += 1
+        self._items.clear()
+        self._head = 0
+        self._total_length = 0
+
+    def snapshot(self):
+        """Return the queue contents as a tuple.
+
+        The tuple is cached against the mutation counter, so repeated
+        display calls between queue changes reuse one copy instead of
+        re-materializing the whole queue each time.
+        """
+        snap = self._snapshot
+        if snap is not None and snap[0] == self._version:
+            return snap[1]
+        items = tuple(self._items[self._head:])
+        self._snapshot = (self._version, items)
+        return items
+
+    def __getitem__(self, index):
+        return self._items[self._index(index)]
+
+    def shuffle(self, rng=random):
+        """Shuffle the queued tracks in place.
+
+        A Fisher-Yates pass over the live region of the backing list, so
+        shuffling never copies the queue out and back.
+        """
+        self._version += 1
+        items = self._items
+        head = self._head
+        for i in range(len(items) - 1, head, -1):
+            j = rng.randrange(head, i + 1)
+            items[i], items[j] = items[j], items[i]
+
+    @property
+    def total_length(self):
+        """Total duration of the queued tracks in ms (O(1))."""
+        return self._total_length
+
+    def __delitem__(self, index):
+        index = self._index(index)
+        self._total_length -= _length(self._items[index])
+        del self._items[index]
+        self._version += 1
+
+    def __len__(self):
+        return len(self._items) - self._head
+
+    def __iter__(self):
+        return islice(iter(self._items), self._head, None)